@@ -1,13 +1,15 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
-from datetime import datetime, date, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
+from datetime import date, timedelta
 from contextlib import contextmanager
+from collections import defaultdict
 import hashlib
+import hmac
 import os
 import re
+import threading
 
 # ---------- PAGE CONFIG (MUST BE FIRST) ----------
 st.set_page_config(
@@ -18,20 +20,45 @@ st.set_page_config(
 )
 
 # ---------- DATABASE UTILITIES ----------
+def apply_pragmas(conn):
+    """Per-connection SQLite tuning (journal_mode is persistent and set in init_db)"""
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+@st.cache_resource
+def get_shared_connection(db_name="expenses.db"):
+    """One long-lived connection per process; writes open with BEGIN IMMEDIATE"""
+    conn = sqlite3.connect(db_name, check_same_thread=False, isolation_level="IMMEDIATE",
+                           cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    apply_pragmas(conn)
+    return conn
+
+@st.cache_resource
+def get_db_lock():
+    return threading.RLock()
+
 @contextmanager
 def get_db_connection():
     """Context manager for database connections"""
-    conn = sqlite3.connect("expenses.db", check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    try:
-        yield conn
-    finally:
-        conn.close()
+    conn = get_shared_connection()
+    with get_db_lock():
+        try:
+            yield conn
+        finally:
+            # Uncommitted work is discarded, as closing a connection used to do
+            if conn.in_transaction:
+                conn.rollback()
 
+@st.cache_resource(show_spinner=False)
 def init_db():
-    """Initialize database with proper schema"""
+    """Initialize database with proper schema, once per process rather than per rerun"""
     with get_db_connection() as conn:
         c = conn.cursor()
+        c.execute("PRAGMA journal_mode=WAL")
         
         # Users table
         c.execute('''CREATE TABLE IF NOT EXISTS users
@@ -63,8 +90,6 @@ def init_db():
                           user_id INTEGER NOT NULL,
                           created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                           FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE)''')
-            c.execute('''CREATE INDEX IF NOT EXISTS idx_expenses_user_date 
-                         ON expenses(user_id, date DESC)''')
         else:
             c.execute("PRAGMA table_info(expenses)")
             columns = [column[1] for column in c.fetchall()]
@@ -77,35 +102,60 @@ def init_db():
                 else:
                     c.execute("DELETE FROM expenses WHERE user_id IS NULL")
         
+        # Covering index: the summary aggregation never has to visit table rows.
+        # It shares the (user_id, date DESC) prefix, so the old index is redundant.
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_expenses_covering
+                     ON expenses(user_id, date DESC, amount, category)''')
+        c.execute("DROP INDEX IF EXISTS idx_expenses_user_date")
+        # Lets the top-category GROUP BY walk categories in index order per user
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_expenses_user_category
+                     ON expenses(user_id, category)''')
+        
         conn.commit()
+        c.execute("PRAGMA optimize")
 
 # ---------- AUTHENTICATION FUNCTIONS ----------
+PBKDF2_ITERATIONS = 200_000
+LEGACY_PBKDF2_ITERATIONS = 100_000
+
 def hash_password(password):
-    salt = os.urandom(16).hex()
-    pw_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), 100000).hex()
-    return f"pbkdf2${salt}${pw_hash}"
+    salt = os.urandom(16)
+    pw_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PBKDF2_ITERATIONS, dklen=32).hex()
+    return f"pbkdf2${PBKDF2_ITERATIONS}${salt.hex()}${pw_hash}"
 
 def verify_password(password, password_hash):
     if password_hash.startswith('pbkdf2$'):
-        _, salt, hash_val = password_hash.split('$')
-        pw_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), 100000).hex()
-        return pw_hash == hash_val
+        parts = password_hash.split('$')
+        try:
+            if len(parts) == 4:
+                _, iterations, salt, hash_val = parts
+                iterations = int(iterations)
+            else:
+                # Hashes created before the iteration count was stored
+                _, salt, hash_val = parts
+                iterations = LEGACY_PBKDF2_ITERATIONS
+            pw_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), iterations).hex()
+        except ValueError:
+            return False  # Malformed stored hash (bad field count, iterations or salt)
+        # Compare bytes: compare_digest rejects str arguments with non-ASCII characters
+        return hmac.compare_digest(pw_hash.encode(), hash_val.encode())
     else:
         # Fallback to legacy sha256
-        return hashlib.sha256(password.encode()).hexdigest() == password_hash
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest().encode(), password_hash.encode())
 
 def create_user(username, password, email=None):
+    if not username or not password:
+        return False, "Username and password are required"
+    if len(password) < 6:
+        return False, "Password must be at least 6 characters"
+    if email and not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+        return False, "Invalid email address format"
+    
+    # Hash before taking the shared connection so other sessions aren't blocked
+    password_hash = hash_password(password)
     with get_db_connection() as conn:
         c = conn.cursor()
         try:
-            if not username or not password:
-                return False, "Username and password are required"
-            if len(password) < 6:
-                return False, "Password must be at least 6 characters"
-            if email and not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-                return False, "Invalid email address format"
-            
-            password_hash = hash_password(password)
             c.execute("INSERT INTO users (username, password_hash, email) VALUES (?, ?, ?)",
                      (username.strip(), password_hash, email))
             conn.commit()
@@ -117,72 +167,127 @@ def create_user(username, password, email=None):
 
 def authenticate_user(username, password):
     with get_db_connection() as conn:
-        c = conn.cursor()
-        c.execute("SELECT id, password_hash FROM users WHERE username = ?", (username,))
-        user = c.fetchone()
-        if user and verify_password(password, user['password_hash']):
-            return user['id']
-        return None
+        user = conn.execute("SELECT id, password_hash FROM users WHERE username = ?", (username,)).fetchone()
+    # Verify outside the connection lock; PBKDF2 is deliberately slow
+    if user and verify_password(password, user['password_hash']):
+        return user['id']
+    return None
 
 # ---------- DATA OPERATIONS ----------
-def get_current_user_expenses(user_id):
+EXPENSE_COLUMNS = ['id', 'category', 'amount', 'date', 'description', 'user_id', 'created_at']
+
+@st.cache_resource
+def get_expense_versions():
+    """Per-user write counters shared by every session; part of the expense cache key"""
+    return defaultdict(int)
+
+# cache_resource hands every caller the same frame instead of unpickling a copy
+# per hit; treat it as read-only and .copy() before mutating (see show_expense_editor)
+@st.cache_resource(show_spinner=False, max_entries=256)
+def load_user_expenses(user_id, version):
     with get_db_connection() as conn:
-        try:
-            df = pd.read_sql(
-                "SELECT * FROM expenses WHERE user_id = ? ORDER BY date DESC", 
-                conn, 
-                params=(user_id,)
-            )
-            if not df.empty and 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-            return df
-        except Exception as e:
-            st.error(f"Error loading expenses: {str(e)}")
-            return pd.DataFrame()
+        c = conn.cursor()
+        c.row_factory = None  # plain tuples for from_records
+        c.execute(
+            f"SELECT {', '.join(EXPENSE_COLUMNS)} FROM expenses WHERE user_id = ? ORDER BY date DESC",
+            (user_id,)
+        )
+        rows = c.fetchall()
+    df = pd.DataFrame.from_records(rows, columns=EXPENSE_COLUMNS)
+    df['amount'] = df['amount'].astype('float64')
+    df['category'] = df['category'].astype('category')
+    if not df.empty:
+        # Dates are stored as ISO strings; naming the format skips per-frame inference
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+    return df
 
-def add_expense(category, amount, expense_date, description, user_id):
-    if description and len(description) > 200:
-        description = description[:200]
-        
+def invalidate_user_expenses(user_id):
+    """Move this user to a new cache key after a write; other users stay cached"""
+    with get_db_lock():
+        get_expense_versions()[user_id] += 1
+
+def get_current_user_expenses(user_id):
+    try:
+        return load_user_expenses(user_id, get_expense_versions()[user_id])
+    except Exception as e:
+        st.error(f"Error loading expenses: {str(e)}")
+        return pd.DataFrame()
+
+def _expense_row(category, amount, expense_date, description, user_id):
+    date_str = expense_date.isoformat() if hasattr(expense_date, 'isoformat') else str(expense_date)
+    desc_str = description.strip()[:200] if description else ""
+    return (category.strip(), amount, date_str, desc_str, user_id)
+
+def add_expenses_bulk(expenses, user_id):
+    """Insert (category, amount, date, description) tuples in one transaction"""
     with get_db_connection() as conn:
         c = conn.cursor()
         try:
-            date_str = expense_date.isoformat() if hasattr(expense_date, 'isoformat') else str(expense_date)
-            desc_str = description.strip() if description else ""
-            c.execute(
+            rows = [_expense_row(*expense, user_id) for expense in expenses]
+            c.executemany(
                 "INSERT INTO expenses (category, amount, date, description, user_id) VALUES (?, ?, ?, ?, ?)",
-                (category.strip(), amount, date_str, desc_str, user_id)
+                rows
             )
             conn.commit()
+            invalidate_user_expenses(user_id)
             return True
         except Exception as e:
             st.error(f"Error adding expense: {str(e)}")
             return False
 
+def add_expense(category, amount, expense_date, description, user_id):
+    return add_expenses_bulk([(category, amount, expense_date, description)], user_id)
+
 def delete_expense(expense_id, user_id):
     with get_db_connection() as conn:
         c = conn.cursor()
         c.execute("DELETE FROM expenses WHERE id=? AND user_id=?", (expense_id, user_id))
         conn.commit()
-        return c.rowcount > 0
+    invalidate_user_expenses(user_id)
+    return c.rowcount > 0
+
+def update_expense(expense_id, user_id, category=None, amount=None, expense_date=None, description=None):
+    """Update the given fields; None leaves a column unchanged"""
+    date_str = str(expense_date) if expense_date is not None else None
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """UPDATE expenses
+               SET category = COALESCE(?, category),
+                   amount = COALESCE(?, amount),
+                   date = COALESCE(?, date),
+                   description = COALESCE(?, description)
+               WHERE id = ? AND user_id = ?""",
+            (category, amount, date_str, description, expense_id, user_id)
+        )
+        conn.commit()
+    invalidate_user_expenses(user_id)
+    return c.rowcount > 0
 
-def get_expense_summary(user_id):
+def get_expense_summary(user_id, today=None):
+    today = today or date.today()
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    last_30_start = today - timedelta(days=30)
+    last_7_start = today - timedelta(days=7)
+    
     with get_db_connection() as conn:
         c = conn.cursor()
         
-        # Main aggregations
+        # Main aggregations (plain ISO range comparisons, no per-row strftime)
         c.execute("""
             SELECT 
                 COALESCE(SUM(amount), 0) as total_expenses,
                 COALESCE(AVG(amount), 0) as average_expense,
-                COUNT(id) as expense_count,
+                COUNT(*) as expense_count,
                 COALESCE(MAX(amount), 0) as largest_expense,
-                COALESCE(SUM(CASE WHEN strftime('%Y-%m', date) = strftime('%Y-%m', 'now', 'localtime') THEN amount ELSE 0 END), 0) as monthly_expenses,
-                COALESCE(SUM(CASE WHEN date >= date('now', '-30 days', 'localtime') THEN amount ELSE 0 END), 0) as last_30_days,
-                COALESCE(SUM(CASE WHEN date >= date('now', '-7 days', 'localtime') THEN amount ELSE 0 END), 0) as last_7_days
+                COALESCE(SUM(CASE WHEN date >= ? AND date < ? THEN amount END), 0) as monthly_expenses,
+                COALESCE(SUM(CASE WHEN date >= ? THEN amount END), 0) as last_30_days,
+                COALESCE(SUM(CASE WHEN date >= ? THEN amount END), 0) as last_7_days
             FROM expenses 
             WHERE user_id = ?
-        """, (user_id,))
+        """, (month_start.isoformat(), next_month_start.isoformat(),
+              last_30_start.isoformat(), last_7_start.isoformat(), user_id))
         
         row = c.fetchone()
         if not row or row['expense_count'] == 0:
@@ -197,7 +302,7 @@ def get_expense_summary(user_id):
             FROM expenses 
             WHERE user_id = ? 
             GROUP BY category 
-            ORDER BY COUNT(id) DESC 
+            ORDER BY COUNT(*) DESC
             LIMIT 1
         """, (user_id,))
         cat_row = c.fetchone()
@@ -205,137 +310,185 @@ def get_expense_summary(user_id):
         
         return summary
 
+CURRENCY_SYMBOL = "₹"
+
 def format_currency(amount):
-    return f"₹{amount:,.2f}"
+    return f"{CURRENCY_SYMBOL}{amount:,.2f}"
+
+def format_currency_series(amounts):
+    """format_currency for a whole column (bound str.format map, no per-row apply)"""
+    # Symbol goes in the format string: str + Series fails on an empty int64 column
+    return amounts.map(f'{CURRENCY_SYMBOL}{{:,.2f}}'.format)
 
 # ---------- CHART FUNCTIONS ----------
-def create_monthly_trend_chart(df):
-    if df.empty or 'date' not in df.columns:
+# plotly is imported inside the figure builders so login-page reruns never load it
+# Shared dark-theme layout, built once; go.Layout copies it into each figure
+CHART_LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='#e2e8f0', size=12),
+    title_font=dict(size=18, color='#e2e8f0'),
+    margin=dict(l=20, r=20, t=50, b=20)
+)
+CHART_AXES = dict(
+    xaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
+    yaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8'))
+)
+
+def compute_chart_data(df, today):
+    """Every aggregation the dashboard charts need, in one place"""
+    amounts = df['amount'].to_numpy()
+    dates = df['date'].to_numpy()
+    
+    # datetime64[M] buckets group on int64 keys instead of Period objects
+    months, month_codes = np.unique(dates.astype('datetime64[M]'), return_inverse=True)
+    monthly = pd.DataFrame({
+        'date': np.datetime_as_string(months, unit='M'),
+        'amount': np.bincount(month_codes, weights=amounts),
+        'id': np.bincount(month_codes)
+    })
+    monthly['amount_formatted'] = format_currency_series(monthly['amount'])
+    
+    # Shared by the pie (descending) and bar (ascending) charts
+    # category is categorical, so its integer codes are the group keys
+    categories = df['category'].cat.categories.to_numpy()
+    codes = df['category'].cat.codes.to_numpy()
+    totals = np.bincount(codes, weights=amounts, minlength=len(categories))
+    present = np.bincount(codes, minlength=len(categories)) > 0
+    order = np.argsort(-totals[present], kind='stable')
+    category_totals = pd.DataFrame({'category': categories[present][order], 'amount': totals[present][order]})
+    category_totals['amount_formatted'] = format_currency_series(category_totals['amount'])
+    
+    # today is an argument so the 30-day window is part of the cache key.
+    # Rows arrive ORDER BY date DESC, so the window is a prefix of the frame.
+    last_30_days = np.datetime64(today - timedelta(days=30))
+    n_recent = len(dates) - np.searchsorted(dates[::-1], last_30_days, side='left')
+    if n_recent == 0:
+        # Nothing in the window: skip bucketing and formatting; the builder returns None
+        daily = pd.DataFrame(columns=['date', 'amount', 'amount_formatted'])
+    else:
+        days, day_codes = np.unique(dates[:n_recent].astype('datetime64[D]'), return_inverse=True)
+        daily = pd.DataFrame({
+            'date': days,
+            'amount': np.bincount(day_codes, weights=amounts[:n_recent])
+        })
+        daily['amount_formatted'] = format_currency_series(daily['amount'])
+    
+    return {'monthly': monthly, 'category': category_totals, 'daily': daily}
+
+def chart_layout(title, x_title=None, y_title=None, **overrides):
+    """Shared layout plus per-chart title; axis titles only for cartesian charts"""
+    layout = dict(CHART_LAYOUT, title=dict(text=title), **overrides)
+    if x_title is not None:
+        layout['xaxis'] = dict(CHART_AXES['xaxis'], title=dict(text=x_title))
+        layout['yaxis'] = dict(CHART_AXES['yaxis'], title=dict(text=y_title))
+    return layout
+
+def create_monthly_trend_chart(monthly):
+    if monthly.empty:
         return None
-        
-    monthly = df.groupby(df['date'].dt.to_period('M')).agg({'amount': 'sum', 'id': 'count'}).reset_index()
-    monthly['date'] = monthly['date'].astype(str)
-    monthly['amount_formatted'] = monthly['amount'].apply(format_currency)
-    
-    fig = px.line(monthly, x='date', y='amount', 
-                  title='📈 Monthly Expense Trends',
-                  labels={'amount': 'Amount (₹)', 'date': 'Month'},
-                  line_shape='spline',
-                  custom_data=[monthly['amount_formatted'], monthly['id']])
-    fig.update_traces(
-        line=dict(width=4, color='#667eea'),
-        mode='lines+markers',
-        marker=dict(size=10, color='#667eea'),
-        hovertemplate='<b>%{x}</b><br>Amount: %{customdata[0]}<br>Transactions: %{customdata[1]}<extra></extra>'
-    )
-    fig.update_layout(
-        hoverlabel=dict(bgcolor="white", font_size=12),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e2e8f0', size=12),
-        title_font=dict(size=18, color='#e2e8f0'),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
-        margin=dict(l=20, r=20, t=50, b=20)
+    
+    import plotly.graph_objects as go
+    
+    return go.Figure(
+        data=go.Scatter(
+            x=monthly['date'].to_numpy(),
+            y=monthly['amount'].to_numpy(),
+            mode='lines+markers',
+            line=dict(width=4, color='#667eea', shape='spline'),
+            marker=dict(size=10, color='#667eea'),
+            customdata=monthly[['amount_formatted', 'id']].to_numpy(),
+            hovertemplate='<b>%{x}</b><br>Amount: %{customdata[0]}<br>Transactions: %{customdata[1]}<extra></extra>'
+        ),
+        layout=chart_layout(
+            '📈 Monthly Expense Trends', 'Month', f'Amount ({CURRENCY_SYMBOL})',
+            hoverlabel=dict(bgcolor="white", font_size=12)
+        )
     )
-    return fig
 
-def create_category_pie_chart(df):
-    if df.empty:
+def create_category_pie_chart(category_totals):
+    if category_totals.empty:
         return None
-        
-    category_totals = df.groupby('category')['amount'].sum().reset_index()
-    category_totals = category_totals.sort_values('amount', ascending=False)
-    category_totals['amount_formatted'] = category_totals['amount'].apply(format_currency)
+    
+    import plotly.graph_objects as go
     
     colors = ['#667eea', '#8b5cf6', '#ec4899', '#f43f5e', '#f97316', '#eab308', '#22c55e', '#14b8a6']
     
-    fig = px.pie(category_totals, values='amount', names='category',
-                 title='🎯 Category Distribution',
-                 hole=0.5,
-                 custom_data=[category_totals['amount_formatted']],
-                 color_discrete_sequence=colors)
-    fig.update_traces(
-        hovertemplate='<b>%{label}</b><br>Amount: %{customdata[0]}<br>Percentage: %{percent}<extra></extra>',
-        textposition='outside',
-        textinfo='percent+label'
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e2e8f0', size=12),
-        title_font=dict(size=18, color='#e2e8f0'),
-        showlegend=True,
-        legend=dict(font=dict(color='#94a3b8')),
-        margin=dict(l=20, r=20, t=50, b=20)
+    return go.Figure(
+        data=go.Pie(
+            labels=category_totals['category'].to_numpy(),
+            values=category_totals['amount'].to_numpy(),
+            hole=0.5,
+            customdata=category_totals[['amount_formatted']].to_numpy(),
+            hovertemplate='<b>%{label}</b><br>Amount: %{customdata[0]}<br>Percentage: %{percent}<extra></extra>',
+            textposition='outside',
+            textinfo='percent+label'
+        ),
+        layout=chart_layout(
+            '🎯 Category Distribution',
+            piecolorway=colors,
+            showlegend=True,
+            legend=dict(font=dict(color='#94a3b8'))
+        )
     )
-    return fig
 
-def create_daily_expense_chart(df):
-    if df.empty or 'date' not in df.columns:
+def create_daily_expense_chart(daily):
+    if daily.empty:
         return None
-        
-    last_30_days = datetime.now() - timedelta(days=30)
-    recent_expenses = df[df['date'] >= last_30_days]
     
-    if recent_expenses.empty:
-        return None
-        
-    daily = recent_expenses.groupby(recent_expenses['date'].dt.date)['amount'].sum().reset_index()
-    daily['amount_formatted'] = daily['amount'].apply(format_currency)
-    
-    fig = px.bar(daily, x='date', y='amount',
-                 title='📊 Daily Expenses (Last 30 Days)',
-                 labels={'amount': 'Amount (₹)', 'date': 'Date'},
-                 custom_data=[daily['amount_formatted']])
-    fig.update_traces(
-        marker_color='#10b981',
-        marker_line_color='#059669',
-        marker_line_width=1,
-        hovertemplate='<b>%{x}</b><br>Amount: %{customdata[0]}<extra></extra>'
+    import plotly.graph_objects as go
+    
+    return go.Figure(
+        data=go.Bar(
+            x=daily['date'].to_numpy(),
+            y=daily['amount'].to_numpy(),
+            marker=dict(color='#10b981', line=dict(color='#059669', width=1)),
+            customdata=daily[['amount_formatted']].to_numpy(),
+            hovertemplate='<b>%{x}</b><br>Amount: %{customdata[0]}<extra></extra>'
+        ),
+        layout=chart_layout('📊 Daily Expenses (Last 30 Days)', 'Date', f'Amount ({CURRENCY_SYMBOL})', bargap=0.3)
     )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e2e8f0', size=12),
-        title_font=dict(size=18, color='#e2e8f0'),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
-        margin=dict(l=20, r=20, t=50, b=20),
-        bargap=0.3
-    )
-    return fig
 
-def create_category_bar_chart(df):
-    if df.empty:
+def create_category_bar_chart(category_totals):
+    if category_totals.empty:
         return None
-        
-    category_totals = df.groupby('category')['amount'].sum().reset_index()
-    category_totals = category_totals.sort_values('amount', ascending=True)
-    category_totals['amount_formatted'] = category_totals['amount'].apply(format_currency)
-    
-    fig = px.bar(category_totals, y='category', x='amount',
-                 title='💳 Expenses by Category',
-                 labels={'amount': 'Amount (₹)', 'category': 'Category'},
-                 orientation='h',
-                 custom_data=[category_totals['amount_formatted']])
-    fig.update_traces(
-        marker_color='#8b5cf6',
-        marker_line_color='#7c3aed',
-        marker_line_width=1,
-        hovertemplate='<b>%{y}</b><br>Amount: %{customdata[0]}<extra></extra>'
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e2e8f0', size=12),
-        title_font=dict(size=18, color='#e2e8f0'),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)', tickfont=dict(color='#94a3b8')),
-        margin=dict(l=20, r=20, t=50, b=20),
-        bargap=0.4
+    
+    import plotly.graph_objects as go
+    
+    category_totals = category_totals.iloc[::-1]
+    
+    return go.Figure(
+        data=go.Bar(
+            x=category_totals['amount'].to_numpy(),
+            y=category_totals['category'].to_numpy(),
+            orientation='h',
+            marker=dict(color='#8b5cf6', line=dict(color='#7c3aed', width=1)),
+            customdata=category_totals[['amount_formatted']].to_numpy(),
+            hovertemplate='<b>%{y}</b><br>Amount: %{customdata[0]}<extra></extra>'
+        ),
+        layout=chart_layout('💳 Expenses by Category', f'Amount ({CURRENCY_SYMBOL})', 'Category', bargap=0.4)
     )
-    return fig
+
+def build_dashboard_charts(df, today):
+    """All dashboard figures from one aggregation pass"""
+    chart_data = compute_chart_data(df, today)
+    return {
+        'monthly': create_monthly_trend_chart(chart_data['monthly']),
+        'category_pie': create_category_pie_chart(chart_data['category']),
+        'daily': create_daily_expense_chart(chart_data['daily']),
+        'category_bar': create_category_bar_chart(chart_data['category'])
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def load_dashboard(user_id, version, today):
+    """Summary metrics and figures for one data version, shared without a pickle copy per rerun"""
+    df = load_user_expenses(user_id, version)
+    if df.empty:
+        return None, None
+    summary = get_expense_summary(user_id, today)
+    if not summary:
+        return None, None
+    return summary, build_dashboard_charts(df, today)
 
 # ---------- CUSTOM CSS ----------
 st.markdown("""
@@ -379,7 +532,6 @@ st.markdown("""
         border-radius: 16px;
         margin-bottom: 25px;
         border: 1px solid rgba(139, 92, 246, 0.3);
-        backdrop-filter: blur(10px);
     }
     
     .user-welcome h3 {
@@ -402,7 +554,6 @@ st.markdown("""
     /* Navigation container */
     .nav-container {
         background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(20px);
         padding: 20px;
         border-radius: 16px;
         border: 1px solid rgba(255, 255, 255, 0.1);
@@ -410,6 +561,18 @@ st.markdown("""
     }
     
     /* Metric cards */
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(4, minmax(0, 1fr));
+        gap: 1rem;
+    }
+    
+    @media (max-width: 640px) {
+        .metric-grid {
+            grid-template-columns: repeat(2, minmax(0, 1fr));
+        }
+    }
+    
     .metric-card {
         background: linear-gradient(135deg, rgba(99, 102, 241, 0.1) 0%, rgba(139, 92, 246, 0.1) 100%);
         padding: 24px;
@@ -420,16 +583,33 @@ st.markdown("""
         display: flex;
         flex-direction: column;
         justify-content: center;
-        transition: all 0.3s ease;
+        position: relative;
+        will-change: transform;
+        transition: transform 0.3s ease, border-color 0.3s ease;
         margin-bottom: 15px;
     }
     
+    /* Hover shadows sit on a pseudo-element and fade via opacity (composited, no repaint) */
+    .metric-card::after {
+        content: "";
+        position: absolute;
+        inset: 0;
+        border-radius: inherit;
+        box-shadow: 0 20px 40px rgba(139, 92, 246, 0.2);
+        opacity: 0;
+        transition: opacity 0.3s ease;
+        pointer-events: none;
+    }
+    
     .metric-card:hover {
         transform: translateY(-4px);
-        box-shadow: 0 20px 40px rgba(139, 92, 246, 0.2);
         border-color: rgba(139, 92, 246, 0.4);
     }
     
+    .metric-card:hover::after {
+        opacity: 1;
+    }
+    
     .metric-card h3 {
         color: #94a3b8;
         font-size: 0.95em;
@@ -459,7 +639,6 @@ st.markdown("""
         margin: 40px auto;
         padding: 40px;
         background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(20px);
         border-radius: 24px;
         border: 1px solid rgba(255, 255, 255, 0.1);
     }
@@ -507,13 +686,28 @@ st.markdown("""
         border: none !important;
         border-radius: 12px !important;
         padding: 12px 28px !important;
-        transition: all 0.3s ease !important;
+        position: relative !important;
+        transition: transform 0.3s ease !important;
         font-size: 1em !important;
     }
     
+    .stButton > button::after {
+        content: "";
+        position: absolute;
+        inset: 0;
+        border-radius: inherit;
+        box-shadow: 0 10px 30px rgba(102, 126, 234, 0.4);
+        opacity: 0;
+        transition: opacity 0.3s ease;
+        pointer-events: none;
+    }
+    
     .stButton > button:hover {
         transform: translateY(-2px) !important;
-        box-shadow: 0 10px 30px rgba(102, 126, 234, 0.4) !important;
+    }
+    
+    .stButton > button:hover::after {
+        opacity: 1;
     }
     
     /* Danger button for delete */
@@ -521,8 +715,8 @@ st.markdown("""
         background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%) !important;
     }
     
-    .delete-btn > button:hover {
-        box-shadow: 0 10px 30px rgba(239, 68, 68, 0.4) !important;
+    .delete-btn > button::after {
+        box-shadow: 0 10px 30px rgba(239, 68, 68, 0.4);
     }
     
     /* Logout button */
@@ -576,7 +770,7 @@ st.markdown("""
         display: flex;
         align-items: center;
         justify-content: space-between;
-        transition: all 0.2s ease;
+        transition: background 0.2s ease, border-color 0.2s ease;
     }
     
     .expense-row:hover {
@@ -652,6 +846,26 @@ st.markdown("""
         background: rgba(102, 126, 234, 0.2);
         color: #a5b4fc;
     }
+    
+    /* Respect reduced-motion: no hover lifts, no transition frames */
+    @media (prefers-reduced-motion: reduce) {
+        .metric-card,
+        .metric-card::after,
+        .stButton > button,
+        .stButton > button::after,
+        .expense-row {
+            transition: none !important;
+        }
+        
+        .metric-card:hover,
+        .stButton > button:hover {
+            transform: none !important;
+        }
+        
+        .metric-card {
+            will-change: auto;
+        }
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -659,16 +873,17 @@ st.markdown("""
 init_db()
 
 # ---------- SESSION STATE ----------
+SESSION_DEFAULTS = {
+    "page": "Dashboard",
+    "user_id": None,
+    "username": None,
+    "show_login": True,
+    "show_register": False
+}
+
+# Defaults are only ever written together, so one membership check covers them all
 if "page" not in st.session_state:
-    st.session_state.page = "Dashboard"
-if "user_id" not in st.session_state:
-    st.session_state.user_id = None
-if "username" not in st.session_state:
-    st.session_state.username = None
-if "show_login" not in st.session_state:
-    st.session_state.show_login = True
-if "show_register" not in st.session_state:
-    st.session_state.show_register = False
+    st.session_state.update(SESSION_DEFAULTS)
 
 # ---------- CATEGORY HELPERS ----------
 CATEGORY_EMOJIS = {
@@ -681,7 +896,9 @@ CATEGORY_EMOJIS = {
     "Other": "📦"
 }
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def get_user_categories(user_id):
+    """Built-in plus custom categories; cached per user, cleared by add_custom_category"""
     cats = CATEGORY_EMOJIS.copy()
     if not user_id: 
         return cats
@@ -709,10 +926,15 @@ def add_custom_category(user_id, name, emoji):
             c.execute("INSERT INTO categories (user_id, name, emoji) VALUES (?, ?, ?)", 
                       (user_id, name.strip(), emoji.strip() if emoji else "📦"))
             conn.commit()
+            get_user_categories.clear(user_id)
             return True
         return False
 
 # ---------- AUTHENTICATION PAGE ----------
+# Inputs live in st.forms (no rerun per keystroke); the toggle uses a callback, no st.rerun()
+def set_show_register(show):
+    st.session_state.show_register = show
+
 def show_auth_page():
     st.markdown("<h1 class='app-title'>💰 SmartSpend</h1>", unsafe_allow_html=True)
     st.markdown("<p class='app-subtitle'>Track your expenses intelligently</p>", unsafe_allow_html=True)
@@ -753,9 +975,7 @@ def show_login_form():
     st.markdown("<br>", unsafe_allow_html=True)
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        if st.button("Create New Account", use_container_width=True):
-            st.session_state.show_register = True
-            st.rerun()
+        st.button("Create New Account", use_container_width=True, on_click=set_show_register, args=(True,))
     
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -793,13 +1013,27 @@ def show_register_form():
     st.markdown("<br>", unsafe_allow_html=True)
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        if st.button("← Back to Login", use_container_width=True):
-            st.session_state.show_register = False
-            st.rerun()
+        st.button("← Back to Login", use_container_width=True, on_click=set_show_register, args=(False,))
     
     st.markdown("</div>", unsafe_allow_html=True)
 
 # ---------- MAIN APP ----------
+METRIC_CARD_HTML = '<div class="metric-card"><h3>{title}</h3><h2>{value}</h2></div>'.format
+
+def render_metric_row(metrics):
+    """One markdown element per row of (title, value) cards, laid out by .metric-grid"""
+    cards = ''.join(METRIC_CARD_HTML(title=title, value=value) for title, value in metrics)
+    st.markdown(f'<div class="metric-grid">{cards}</div>', unsafe_allow_html=True)
+
+# Callbacks run before the click's rerun, so navigation needs no second st.rerun()
+def set_page(page):
+    st.session_state.page = page
+
+def logout():
+    st.session_state.user_id = None
+    st.session_state.username = None
+    st.session_state.show_login = True
+
 def show_main_app():
     # Title
     st.markdown("<h1 class='app-title'>💰 SmartSpend</h1>", unsafe_allow_html=True)
@@ -817,24 +1051,14 @@ def show_main_app():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if st.button("📊 Dashboard", use_container_width=True):
-            st.session_state.page = "Dashboard"
-            st.rerun()
+        st.button("📊 Dashboard", use_container_width=True, on_click=set_page, args=("Dashboard",))
     with col2:
-        if st.button("➕ Add Expense", use_container_width=True):
-            st.session_state.page = "Add Expense"
-            st.rerun()
+        st.button("➕ Add Expense", use_container_width=True, on_click=set_page, args=("Add Expense",))
     with col3:
-        if st.button("📋 View All", use_container_width=True):
-            st.session_state.page = "View All"
-            st.rerun()
+        st.button("📋 View All", use_container_width=True, on_click=set_page, args=("View All",))
     with col4:
         st.markdown("<div class='logout-btn'>", unsafe_allow_html=True)
-        if st.button("🚪 Logout", use_container_width=True):
-            st.session_state.user_id = None
-            st.session_state.username = None
-            st.session_state.show_login = True
-            st.rerun()
+        st.button("🚪 Logout", use_container_width=True, on_click=logout)
         st.markdown("</div>", unsafe_allow_html=True)
     
     st.markdown("</div>", unsafe_allow_html=True)
@@ -850,79 +1074,32 @@ def show_main_app():
 def show_dashboard():
     st.markdown("<div class='section-header'>📊 Expense Dashboard</div>", unsafe_allow_html=True)
     
-    df = get_current_user_expenses(st.session_state.user_id)
-    summary = get_expense_summary(st.session_state.user_id)
-    
-    if summary and not df.empty:
-        # Metrics Row 1
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>💰 Total Spent</h3>
-                    <h2>{format_currency(summary['total_expenses'])}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>📅 This Month</h3>
-                    <h2>{format_currency(summary['monthly_expenses'])}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>📝 Transactions</h3>
-                    <h2>{summary['expense_count']}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>📊 Daily Average</h3>
-                    <h2>{format_currency(summary['daily_average'])}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        # Metrics Row 2
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>🔥 Last 7 Days</h3>
-                    <h2>{format_currency(summary['last_7_days'])}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>📆 Last 30 Days</h3>
-                    <h2>{format_currency(summary['last_30_days'])}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>💵 Avg Expense</h3>
-                    <h2>{format_currency(summary['average_expense'])}</h2>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3>🏆 Top Category</h3>
-                    <h2>{get_category_emoji(summary['top_category'])} {summary['top_category']}</h2>
-                </div>
-            """, unsafe_allow_html=True)
+    user_id = st.session_state.user_id
+    # One clock read per render, shared by the summary windows and the charts
+    today = date.today()
+    try:
+        summary, charts = load_dashboard(user_id, get_expense_versions()[user_id], today)
+    except Exception as e:
+        st.error(f"Error loading expenses: {str(e)}")
+        summary, charts = None, None
+    
+    if summary:
+        metric_rows = [
+            [
+                ("💰 Total Spent", format_currency(summary['total_expenses'])),
+                ("📅 This Month", format_currency(summary['monthly_expenses'])),
+                ("📝 Transactions", summary['expense_count']),
+                ("📊 Daily Average", format_currency(summary['daily_average']))
+            ],
+            [
+                ("🔥 Last 7 Days", format_currency(summary['last_7_days'])),
+                ("📆 Last 30 Days", format_currency(summary['last_30_days'])),
+                ("💵 Avg Expense", format_currency(summary['average_expense'])),
+                ("🏆 Top Category", f"{get_category_emoji(summary['top_category'])} {summary['top_category']}")
+            ]
+        ]
+        for metrics in metric_rows:
+            render_metric_row(metrics)
         
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("<div class='section-header'>📈 Visual Analytics</div>", unsafe_allow_html=True)
@@ -932,7 +1109,7 @@ def show_dashboard():
         
         with col1:
             st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            monthly_chart = create_monthly_trend_chart(df)
+            monthly_chart = charts['monthly']
             if monthly_chart:
                 st.plotly_chart(monthly_chart, use_container_width=True)
             else:
@@ -941,7 +1118,7 @@ def show_dashboard():
         
         with col2:
             st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            category_pie = create_category_pie_chart(df)
+            category_pie = charts['category_pie']
             if category_pie:
                 st.plotly_chart(category_pie, use_container_width=True)
             else:
@@ -953,7 +1130,7 @@ def show_dashboard():
         
         with col1:
             st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            daily_chart = create_daily_expense_chart(df)
+            daily_chart = charts['daily']
             if daily_chart:
                 st.plotly_chart(daily_chart, use_container_width=True)
             else:
@@ -962,7 +1139,7 @@ def show_dashboard():
         
         with col2:
             st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            category_bar = create_category_bar_chart(df)
+            category_bar = charts['category_bar']
             if category_bar:
                 st.plotly_chart(category_bar, use_container_width=True)
             else:
@@ -980,9 +1157,7 @@ def show_dashboard():
         
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            if st.button("➕ Add Your First Expense", use_container_width=True):
-                st.session_state.page = "Add Expense"
-                st.rerun()
+            st.button("➕ Add Your First Expense", use_container_width=True, on_click=set_page, args=("Add Expense",))
 
 def show_add_expense():
     st.markdown("<div class='section-header'>➕ Add New Expense</div>", unsafe_allow_html=True)
@@ -997,7 +1172,7 @@ def show_add_expense():
             category = st.selectbox(
                 "Category",
                 list(user_cats.keys()),
-                format_func=lambda x: f"{get_category_emoji(x)} {x}"
+                format_func=lambda x: f"{user_cats[x]} {x}"
             )
             amount = st.number_input("Amount (₹)", min_value=0.01, step=0.01, format="%.2f")
         
@@ -1057,10 +1232,10 @@ def show_view_all():
         col1, col2 = st.columns([3, 1])
         with col2:
             st.markdown("<br>", unsafe_allow_html=True)  # alignment
-            csv_data = df.to_csv(index=False).encode('utf-8')
+            # Callable data: the CSV is only serialized when the button is clicked
             st.download_button(
                 label="⬇️ Download CSV",
-                data=csv_data,
+                data=lambda: df.to_csv(index=False).encode('utf-8'),
                 file_name='smartspend_expenses.csv',
                 mime='text/csv',
                 use_container_width=True
@@ -1069,69 +1244,82 @@ def show_view_all():
         with col1:
             st.markdown("<p style='color: #94a3b8; padding-top: 15px;'>Edit cells directly or select rows to delete. Click Save Changes when done.</p>", unsafe_allow_html=True)
         
-        # Prepare DataEditor
-        edit_df = df[['id', 'date', 'category', 'description', 'amount']].copy()
-        edit_df['date'] = pd.to_datetime(edit_df['date']).dt.date
-        
-        edited_state = st.data_editor(
-            edit_df,
-            hide_index=True,
-            column_config={
-                "id": None, # hidden
-                "date": st.column_config.DateColumn("Date", required=True),
-                "category": st.column_config.SelectboxColumn(
-                    "Category",
-                    help="Expense Category",
-                    width="medium",
-                    options=list(get_user_categories(st.session_state.user_id).keys()),
-                    required=True
-                ),
-                "description": st.column_config.TextColumn("Description"),
-                "amount": st.column_config.NumberColumn("Amount (₹)", min_value=0.01, format="%.2f", required=True)
-            },
-            num_rows="dynamic",
-            use_container_width=True,
-            key="expense_editor_grid"
-        )
-        
-        # We need a form or simple button to save
-        if st.button("💾 Save Changes", use_container_width=True):
-            changes = st.session_state.expense_editor_grid
-            changes_made = False
-            
-            # Deletions
-            for row_idx in changes.get("deleted_rows", []):
-                expense_id = int(edit_df.iloc[row_idx]["id"])
-                delete_expense(expense_id, st.session_state.user_id)
-                changes_made = True
-            
-            # Edits
-            for row_idx, edits in changes.get("edited_rows", {}).items():
-                row_idx = int(row_idx)
-                orig_row = edit_df.iloc[row_idx]
-                expense_id = int(orig_row["id"])
-                new_cat = edits.get("category", orig_row["category"])
-                new_desc = edits.get("description", orig_row["description"])
-                new_amt = edits.get("amount", orig_row["amount"])
-                new_date = edits.get("date", orig_row["date"])
-                
-                with get_db_connection() as conn:
-                    conn.execute("UPDATE expenses SET category=?, description=?, amount=?, date=? WHERE id=? AND user_id=?", 
-                                 (new_cat, new_desc, new_amt, str(new_date), expense_id, st.session_state.user_id))
-                    conn.commit()
-                changes_made = True
-                    
-            # Additions
-            for row in changes.get("added_rows", []):
-                if "amount" in row and "category" in row and "date" in row:
-                    add_expense(row["category"], row["amount"], row["date"], row.get("description", ""), st.session_state.user_id)
-                    changes_made = True
-                    
-            if changes_made:
-                st.success("✅ Changes saved successfully!")
-                st.rerun()
-            else:
-                st.info("No changes to save.")
+        show_expense_editor(df)
+
+@st.fragment
+def show_expense_editor(df):
+    """Editor grid and save button; cell edits rerun only this fragment"""
+    # Prepare DataEditor
+    edit_df = df[['id', 'date', 'category', 'description', 'amount']].copy()
+    edit_df['date'] = edit_df['date'].dt.date
+    # Edits may introduce categories the categorical dtype doesn't know about
+    edit_df['category'] = edit_df['category'].astype(object)
+    
+    edited_state = st.data_editor(
+        edit_df,
+        hide_index=True,
+        column_config={
+            "id": None, # hidden
+            "date": st.column_config.DateColumn("Date", required=True),
+            "category": st.column_config.SelectboxColumn(
+                "Category",
+                help="Expense Category",
+                width="medium",
+                options=list(get_user_categories(st.session_state.user_id).keys()),
+                required=True
+            ),
+            "description": st.column_config.TextColumn("Description"),
+            "amount": st.column_config.NumberColumn("Amount (₹)", min_value=0.01, format="%.2f", required=True)
+        },
+        num_rows="dynamic",
+        use_container_width=True,
+        key="expense_editor_grid"
+    )
+    
+    # We need a form or simple button to save
+    if st.button("💾 Save Changes", use_container_width=True):
+        changes = st.session_state.expense_editor_grid
+        changes_made = False
+    
+        # Additions first: they share one transaction, so a bad row rejects the batch.
+        # Stop before touching anything else and keep the grid so the rows can be fixed.
+        new_rows = [
+            (row["category"], row["amount"], row["date"], row.get("description", ""))
+            for row in changes.get("added_rows", [])
+            if "amount" in row and "category" in row and "date" in row
+        ]
+        if new_rows:
+            if not add_expenses_bulk(new_rows, st.session_state.user_id):
+                st.error("❌ New rows were not saved. Fix them and click Save Changes again.")
+                return
+            changes_made = True
+    
+        # Deletions
+        for row_idx in changes.get("deleted_rows", []):
+            expense_id = int(edit_df.iloc[row_idx]["id"])
+            delete_expense(expense_id, st.session_state.user_id)
+            changes_made = True
+    
+        # Edits
+        for row_idx, edits in changes.get("edited_rows", {}).items():
+            row_idx = int(row_idx)
+            expense_id = int(edit_df.iloc[row_idx]["id"])
+            update_expense(
+                expense_id,
+                st.session_state.user_id,
+                category=edits.get("category"),
+                amount=edits.get("amount"),
+                expense_date=edits.get("date"),
+                # A cleared description cell comes back as None
+                description=(edits["description"] or "") if "description" in edits else None
+            )
+            changes_made = True
+    
+        if changes_made:
+            st.success("✅ Changes saved successfully!")
+            st.rerun()
+        else:
+            st.info("No changes to save.")
 
 # ---------- MAIN APP LOGIC ----------
 if st.session_state.show_login or st.session_state.user_id is None: